@@ -72,6 +72,7 @@ class AnalysisConvergence(AnalysisTab):
 
         Plots the orthonormality error for each mode for a given state.
         '''
+        plot = self.window().plot
         output = self.runCmd(['ortho'])
         # get the relevant data we want (between the two #, but skip first line
         # which is the header - see docstring)
@@ -79,26 +80,26 @@ class AnalysisConvergence(AnalysisTab):
         if len(match) != 1:
             raise ValueError('Invalid ortho output?')
         # assemble data matrix
-        self.window().data = self.readFloats(match[0].split('\n'))
+        data = self.window().data = self.readFloats(match[0].split('\n'))
 
         # only select rows where state column equals user selected state, using
         # a numpy mask
         state = self.ortho_state.value()
-        arr = self.window().data[self.window().data[:, 1] == state, :]
+        arr = data[data[:, 1] == state, :]
         if arr.size == 0:
-            max_state = self.window().data[:, 1].max()
+            max_state = data[:, 1].max()
             raise ValueError(f'Selected state {state} is larger than highest '
                              f'state {int(max_state)}')
         # number of modes is number of columns minus time, state, total columns
-        n_modes = self.window().data.shape[1] - 3
+        n_modes = data.shape[1] - 3
         # start plotting
-        self.window().plot.reset(switch_to_plot=True)
-        self.window().plot.setLabels(title='SPF Orthonormality',
-                                     bottom='Time (fs)', left='Orthonormality error')
-        self.window().plot.plot(arr[:, 0], arr[:, 2], name='Total', pen='k')
+        plot.reset(switch_to_plot=True)
+        plot.setLabels(title='SPF Orthonormality', bottom='Time (fs)',
+                       left='Orthonormality error')
+        plot.plot(arr[:, 0], arr[:, 2], name='Total', pen='k')
         for i in range(1, n_modes+1):
-            self.window().plot.plot(arr[:, 0], arr[:, 2+i], name=f'Mode {i}',
-                                    pen=colr(i-1, n_modes, maxValue=200))
+            plot.plot(arr[:, 0], arr[:, 2+i], name=f'Mode {i}',
+                      pen=colr(i-1, n_modes, maxValue=200))
 
     def rdgpop(self):
         '''
@@ -157,6 +158,7 @@ class AnalysisConvergence(AnalysisTab):
 
         Plots the populations of natural orbitals against time.
         '''
+        plot = self.window().plot
         # additional arguments for natpop
         natpop_options = [
             str(self.natpop_mode.value()),
@@ -168,16 +170,16 @@ class AnalysisConvergence(AnalysisTab):
         filepath = self.window().dir.cwd/f'natpop_{"_".join(natpop_options)}.pl'
         # assemble data matrix
         with open(filepath, mode='r', encoding='utf-8') as f:
-            self.window().data = self.readFloats(f)
+            data = self.window().data = self.readFloats(f)
 
         # start plotting
-        self.window().plot.reset(switch_to_plot=True)
-        self.window().plot.setLabels(title='Natural population',
-                                     bottom='Time (fs)', left='Weight')
-        n_spfs = self.window().data.shape[1] - 1 # minus time column
+        plot.reset(switch_to_plot=True)
+        plot.setLabels(title='Natural population', bottom='Time (fs)',
+                       left='Weight')
+        n_spfs = data.shape[1] - 1 # minus time column
         for i in range(1, n_spfs + 1):
-            self.window().plot.plot(self.window().data[:, 0], self.window().data[:, i],
-                                    name=f'SPF {i}', pen=colr(i-1, n_spfs, maxValue=200))
+            plot.plot(data[:, 0], data[:, i], name=f'SPF {i}',
+                      pen=colr(i-1, n_spfs, maxValue=200))
 
     def qdq(self):
         '''
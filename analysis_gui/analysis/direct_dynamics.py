@@ -117,10 +117,14 @@ class AnalysisDirectDynamics(AnalysisTab):
         filepath = self.window().dir.cwd/'log'
         times = []
         n_calcs = []
+        # clear the text view first, so the output of the previous analysis
+        # isn't left behind if the log can't be read
         self.window().text.clear()
+        # lines of the log, shown in the text view all at once at the end
+        lines = []
         with open(filepath, mode='r', encoding='utf-8') as f:
             for line in f:
-                self.window().text.appendPlainText(line[:-1])
+                lines.append(line[:-1])
                 # find a line with time[fs] in it and get time
                 if re.search(r'time\[fs\]', line):
                     try:
@@ -136,6 +140,7 @@ class AnalysisDirectDynamics(AnalysisTab):
                         n_calcs[-1] += n_calc
                     except ValueError:
                         pass
+        self.window().text.setPlainText('\n'.join(lines))
         if len(times) == 0:
             # nothing found?
             raise ValueError('Invalid log file')
@@ -165,12 +170,13 @@ class AnalysisDirectDynamics(AnalysisTab):
         Plots the GWPs' center or momentum for a given mode. No legend is
         output.
         '''
+        plot = self.window().plot
         # -trj outputs a trajectory file only
         self.runCmd(['gwptraj', '-trj'])
         filepath = self.window().dir.cwd/'trajectory'
         # assemble data matrix
         with open(filepath, mode='r', encoding='utf-8') as f:
-            self.window().data = self.readFloats(f)
+            data = self.window().data = self.readFloats(f)
 
         # add contents of showd1d.log to text view
         filepath = self.window().dir.cwd/'gwptraj.log'
@@ -200,30 +206,29 @@ class AnalysisDirectDynamics(AnalysisTab):
         mode = self.gwptraj_mode.value()
         # the number of columns is 2*number of gaussians*number of modes. the
         # 2 is from the momenta being written after the gwp centers
-        ncol = self.window().data.shape[1]
+        ncol = data.shape[1]
         nmode = (ncol-1)//(2*ngwp)
         if mode > nmode:
             raise ValueError(f'Mode {mode} is larger than number of modes {nmode}')
         # start plotting
-        self.window().plot.reset(switch_to_plot=True)
+        plot.reset(switch_to_plot=True)
         if self.gwptraj_task.currentIndex() == 0:
             # task is plot centre coordinates, which make up the first half of
             # the columns in trajectory file
             offset = mode
-            self.window().plot.setLabels(title='GWP function centre coordinates',
-                                          bottom='Time (fs)', left='GWP Center (au)')
+            plot.setLabels(title='GWP function centre coordinates',
+                           bottom='Time (fs)', left='GWP Center (au)')
         else:
             # task is plot momentum, which make up the second half of the
             # columns in trajectory file
             offset = (ncol-1)//2 + mode
-            self.window().plot.setLabels(title='GWP function momentum',
-                                          bottom='Time (fs)', left='GWP Momentum (au)')
+            plot.setLabels(title='GWP function momentum',
+                           bottom='Time (fs)', left='GWP Momentum (au)')
         # plot line for each gaussian. columns are written for each gaussian
         # with ascending mode. to pick the gaussians for one mode we skip
         # nmode columns each time until we get to ngwp lines
         for i, col in enumerate(range(offset, offset+ngwp*nmode, nmode)):
-            self.window().plot.plot(self.window().data[:, 0], self.window().data[:, col],
-                                     pen=colr(i, ngwp, maxValue=200))
+            plot.plot(data[:, 0], data[:, col], pen=colr(i, ngwp, maxValue=200))
 
     def ddpesgeo(self):
         '''
@@ -403,7 +408,7 @@ class AnalysisDirectDynamics(AnalysisTab):
         else:
             mode = 'ro'
         con = sqlite3.connect(f'file:{filepath}?mode={mode}', uri=True,
-                              timeout=float(self.window().timeout.value()),
+                              timeout=self.window().timeout.value(),
                               isolation_level=None)
         cur = con.cursor()
         res = cur.execute(query).fetchall()
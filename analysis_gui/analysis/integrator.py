@@ -87,7 +87,7 @@ class AnalysisIntegrator(AnalysisTab):
             # should find one name and five floats per line (name, a, b, c, d,
             # e). after splitting by whitespace, floats should take up the last
             # 5 entries, and the name take up the rest
-            row = re.findall(r'\S+', line)
+            row = line.split()
             if len(row) >= 5:
                 name = ' '.join(row[:-5])
                 floats = row[-5:]
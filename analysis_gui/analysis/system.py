@@ -142,15 +142,12 @@ class AnalysisSystem(AnalysisTab):
         Allows the user to move the scrubber to control time when using the
         showd1d analysis.
         '''
-        re, im = self.window().plot.listDataItems()
-        scrubber_pos = int(self.window().media.scrubber.value())
-        self.window().plot.setLabels(
-            top=f't={self.window().data[scrubber_pos][0][1]} fs'
-        )
-        re.setData(self.window().data[scrubber_pos][:, 0],
-                   self.window().data[scrubber_pos][:, 2])
-        im.setData(self.window().data[scrubber_pos][:, 0],
-                   self.window().data[scrubber_pos][:, 3])
+        window = self.window()
+        re, im = window.plot.listDataItems()
+        data = window.data[int(window.media.scrubber.value())]
+        window.plot.setLabels(top=f't={data[0][1]} fs')
+        re.setData(data[:, 0], data[:, 2])
+        im.setData(data[:, 0], data[:, 3])
 
     def showd2d(self):
         '''
@@ -264,9 +261,10 @@ class AnalysisSystem(AnalysisTab):
         Allows the user to move the scrubber to control time when using the
         showd2d analysis.
         '''
-        scrubber_pos = int(self.window().media.scrubber.value())
-        for isocurve in self.window().plot.getPlotItem().items:
-            isocurve.setData(self.window().data[scrubber_pos])
+        window = self.window()
+        z = window.data[int(window.media.scrubber.value())]
+        for isocurve in window.plot.getPlotItem().items:
+            isocurve.setData(z)
 
     def statepop(self):
         '''
@@ -281,20 +279,21 @@ class AnalysisSystem(AnalysisTab):
         where t is time and s1 ... sn are the populations for that time for
         state n. Plots time and population for each state.
         '''
+        plot = self.window().plot
         self.runCmd(['statepop', '-w'])
         filepath = self.window().dir.cwd/'spops'
         # assemble data matrix
         with open(filepath, mode='r', encoding='utf-8') as f:
-            self.window().data = self.readFloats(f, ignore_regex=r'^#')
+            data = self.window().data = self.readFloats(f, ignore_regex=r'^#')
 
         # start plotting
-        self.window().plot.reset(switch_to_plot=True)
-        self.window().plot.setLabels(title='State population',
-                                     bottom='Time (fs)', left='Population')
-        n_states = self.window().data.shape[1] - 1 # minus time column
+        plot.reset(switch_to_plot=True)
+        plot.setLabels(title='State population', bottom='Time (fs)',
+                       left='Population')
+        n_states = data.shape[1] - 1 # minus time column
         for i in range(1, n_states + 1):
-            self.window().plot.plot(self.window().data[:, 0], self.window().data[:, i],
-                                    name=f'State {i}', pen=colr(i-1, n_states, maxValue=200))
+            plot.plot(data[:, 0], data[:, i], name=f'State {i}',
+                      pen=colr(i-1, n_states, maxValue=200))
 
     def showpes(self):
         '''
@@ -18,11 +18,20 @@ class TestAnalyses(unittest.TestCase):
     Tests various python-implemented analysis methods.
     '''
 
+    @classmethod
+    def setUpClass(cls):
+        '''
+        The method to execute once before running the test procedures.
+        '''
+        # share a single QApplication between all tests (see
+        # TestConvenienceMethods.setUpClass in test_misc.py for why)
+        cls.app = (main_window.QtWidgets.QApplication.instance()
+                   or main_window.QtWidgets.QApplication(sys.argv))
+
     def setUp(self):
         '''
         The method to execute before running a test procedure.
         '''
-        self.app = main_window.QtWidgets.QApplication(sys.argv)
         self.window = main_window.AnalysisMain()
         self.fixtures_dir = Path(__file__).parent/'fixtures'
 
@@ -100,6 +109,4 @@ class TestAnalyses(unittest.TestCase):
         The method to execute after executing a test procedure.
         '''
         self.window.close()
-        self.app.quit()
-        del self.app
 
@@ -8,27 +8,39 @@ Consists of the class that provides unit testing for miscellaneous methods
 
 from pathlib import Path
 from time import perf_counter
+import subprocess
 import sys
+import tempfile
 import unittest
 import numpy as np
 from ..ui import main_window
 
 class TestConvenienceMethods(unittest.TestCase):
     '''
-    Tests the AnalysisTab.readFloats and CustomTextWidget.writeTable methods.
-    AnalysisTab.runCmd not tested since that would essentially be a test of the
-    subprocess module.
+    Tests the AnalysisTab.readFloats, AnalysisTab.runCmd,
+    CustomTextWidget.writeTable, CoordinateSelector.findModeLabels and
+    CoordinateSelector.refresh methods.
     '''
     # parameters to generate a file with a grid of random numbers
     N_COLUMNS = 5
     N_ROWS = 20000
 
+    @classmethod
+    def setUpClass(cls):
+        '''
+        The method to execute once before running the test procedures.
+        '''
+        # qt only supports one QApplication per process, and creating and
+        # destroying one per test leaves stale wrappers behind that can crash
+        # pyqtgraph later on, so share a single instance between all tests
+        cls.app = (main_window.QtWidgets.QApplication.instance()
+                   or main_window.QtWidgets.QApplication(sys.argv))
+
     def setUp(self):
         '''
         The method to execute before running a test procedure.
         '''
         # open a main window, no need to show it though
-        self.app = main_window.QtWidgets.QApplication(sys.argv)
         self.window = main_window.AnalysisMain()
         # generate random floats with mantissa between -1 and 1, exponent
         # (base 2) between -32 and 32. this way some will numbers will be
@@ -57,6 +69,20 @@ class TestConvenienceMethods(unittest.TestCase):
                   f'took {perf_counter() - time} s')
         self.assertTrue(np.array_equal(read_grid, self.grid))
 
+    def testReadFloatsIrregular(self):
+        '''
+        Tests that the readFloats method in the AnalysisMain class skips lines
+        that don't have the right number of floats or match ignore_regex.
+        '''
+        lines = ['# t  x  y', 'header 1 2', '1 2 3', '  1.5E+03\t-inf  .5  ',
+                 '1 2', '', '4 5 6 7', 'NaN +3. 4e-5', '# 7 8 9',
+                 '\u0661 \u0662 \u0663']
+        read_grid = self.window.analconv.readFloats(lines, 3, ignore_regex=r'^#')
+        expected = np.array([[1, 2, 3], [1.5e3, -np.inf, 0.5], [np.nan, 3, 4e-5]])
+        self.assertTrue(np.array_equal(read_grid, expected, equal_nan=True))
+        with self.assertRaises(ValueError):
+            self.window.analconv.readFloats(lines, 5)
+
     def testWriteTable(self):
         '''
         Tests that the readFloats method can successfully reproduce the
@@ -73,12 +99,78 @@ class TestConvenienceMethods(unittest.TestCase):
         # since write table only has limited precision must use approximation
         self.assertTrue(np.allclose(read_grid, self.grid))
 
+    def testRunCmd(self):
+        '''
+        Tests that the runCmd method in the AnalysisTab class returns the
+        output of the command and shows it in the text widget, and that a
+        command failing or timing out raises an error.
+        '''
+        output = self.window.analconv.runCmd(
+            [sys.executable, '-c', 'print("hello"); print("world")']
+        )
+        self.assertEqual(output, 'hello\nworld\n')
+        self.assertEqual(self.window.text.toPlainText(), 'hello\nworld\n')
+        with self.assertRaises(subprocess.SubprocessError):
+            self.window.analconv.runCmd([sys.executable, '-c', 'exit(1)'])
+        self.window.timeout.setValue(0.5)
+        with self.assertRaises(subprocess.SubprocessError):
+            self.window.analconv.runCmd(
+                [sys.executable, '-c', 'import time; time.sleep(5)']
+            )
+
+    def testFindModeLabels(self):
+        '''
+        Tests that the findModeLabels method in the CoordinateSelector class
+        finds the mode labels in the input file, and finds them again when the
+        input file is changed.
+        '''
+        coord = self.window.analsys.den2d_coord
+        with tempfile.TemporaryDirectory() as dirname:
+            self.window.dir.cwd = dirname
+            with self.assertRaises(FileNotFoundError):
+                coord.findModeLabels()
+            input_file = Path(dirname)/'input'
+            input_file.write_text('SPF-BASIS-SECTION\n'
+                                  '    v1, v2 = 5, 5\n'
+                                  '    v3 = 3\n'
+                                  'end-spf-basis-section\n', encoding='utf-8')
+            self.assertEqual(coord.findModeLabels(), ['v1', 'v2', 'v3'])
+            input_file.write_text('initial-geometry-section\n'
+                                  'nmode\n'
+                                  'q1  0.0  1.0\n'
+                                  'q2  0.0  1.0\n'
+                                  'end-nmode\n'
+                                  'end-initial-geometry-section\n', encoding='utf-8')
+            self.assertEqual(coord.findModeLabels(), ['q1', 'q2'])
+
+    def testRefreshModeLabels(self):
+        '''
+        Tests that the CoordinateSelector class still has an x and y coordinate
+        after refreshing, if the rows that were x and y have been removed.
+        '''
+        coord = self.window.analsys.den2d_coord
+        with tempfile.TemporaryDirectory() as dirname:
+            self.window.dir.cwd = dirname
+            input_file = Path(dirname)/'input'
+            input_file.write_text('SPF-BASIS-SECTION\n'
+                                  '    a, b, c, d = 5, 5, 5, 5\n'
+                                  'end-spf-basis-section\n', encoding='utf-8')
+            coord.refresh()
+            self.assertEqual((coord.xcoord, coord.ycoord), ('a', 'b'))
+            # select the last rows, then remove them
+            coord._selects[2].setCurrentIndex(1)
+            coord._selects[3].setCurrentIndex(0)
+            self.assertEqual((coord.xcoord, coord.ycoord), ('d', 'c'))
+            input_file.write_text('SPF-BASIS-SECTION\n'
+                                  '    a, b = 5, 5\n'
+                                  'end-spf-basis-section\n', encoding='utf-8')
+            coord.refresh()
+            self.assertEqual((coord.xcoord, coord.ycoord), ('a', 'b'))
+            self.assertEqual(str(coord), 'a x\nb y\n')
+
     def tearDown(self):
         '''
         The method to execute after executing a test procedure.
         '''
         self.filename.unlink()
         self.window.close()
-        self.app.quit()
-        # required to prevent some errors with python's auto garbage collection
-        del self.app
@@ -2,13 +2,21 @@
 '''
 @author: 19081417
 
-Consists of the abstract class for the analysis tabs in the main UI.
+Consists of the abstract class for the analysis tabs in the main UI, and the
+QRunnable used by it to wait for commands outside the GUI thread.
 '''
 
 from shlex import split as shsplit
+from types import MappingProxyType
+import codecs
+import io
+import os
 import re
+import selectors
+import signal
 import subprocess
 import sys
+import threading
 import traceback
 
 import numpy as np
@@ -28,6 +36,12 @@ class AnalysisTab(QtWidgets.QWidget):
     Also consists of a couple convenience functions which may aid with writing
     analysis functions.
     '''
+    # regex matching a single float in any form python's float() accepts
+    # (except with underscores or non-ascii digits, which numpy doesn't
+    # accept), such as 1, -.5, 1.234E-10, inf or nan
+    FLOAT_REGEX = r'[+-]?(?:(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:e[+-]?[0-9]+)?|inf(?:inity)?|nan)'
+    # whether an analysis is running, shared between all of the tabs
+    _busy = False
 
     def __init__(self, ui_file:str, *args, **kwargs):
         '''
@@ -61,10 +75,14 @@ class AnalysisTab(QtWidgets.QWidget):
               disabled (with text giving the missing file(s)).
         '''
         self.methods = methods
-        self.options = options
+        # take a read-only copy rather than keeping the caller's dictionary,
+        # so the tabs can't end up sharing (and mutating) the same one
+        self.options = MappingProxyType(dict(options))
         self.required_files = required_files
-        # list of the radio buttons inside the list widget
-        self.radio = self.list_widget.findChildren(QtWidgets.QRadioButton)
+        # tuple of the radio buttons inside the list widget, as well as their
+        # (bound) isChecked methods, which are called on every radio click
+        self.radio = tuple(self.list_widget.findChildren(QtWidgets.QRadioButton))
+        self._radio_is_checked = tuple(radio.isChecked for radio in self.radio)
         if len(self.radio) != len(self.methods):
             raise ValueError('There must be a corresponding method for each '
                              'radio button.')
@@ -94,8 +112,8 @@ class AnalysisTab(QtWidgets.QWidget):
         '''
         # need to iterate over all radio boxes rather than just the one selected
         # since options box needs to be hidden for radio boxes NOT selected
-        for index, radio in enumerate(self.radio):
-            if radio.isChecked():
+        for index, is_checked in enumerate(self._radio_is_checked):
+            if is_checked():
                 # check file associated with radio button exists
                 self.checkFileExists(index)
                 if index in self.options:
@@ -109,17 +127,27 @@ class AnalysisTab(QtWidgets.QWidget):
         Action to perform when the tab's analyse button is pushed, which is to
         call the associated method given in self.methods.
         '''
+        # user input is only deferred (not discarded) while an analysis is
+        # running, so ignore clicks made in the meantime
+        if AnalysisTab._busy:
+            return
         # get index of checked radio button (there should only be 1)
-        radio_index = [index for index, radio in enumerate(self.radio)
-                       if radio.isChecked()][0]
+        radio_index = [index for index, is_checked in enumerate(self._radio_is_checked)
+                       if is_checked()][0]
         # set cursor to wait cursor
         QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
         # freeze push button until method is executed
         self.analyse.setEnabled(False)
         self.analyse.setText('Busy')
         # force pyqt to update button immediately (otherwise pyqt leaves
-        # this until the next event loop and nothing happens)
-        self.analyse.repaint()
+        # this until the next event loop and nothing happens). user input is
+        # deferred until the method has executed (as it also is while waiting
+        # for commands in self.runCmd)
+        AnalysisTab._busy = True
+        QtWidgets.QApplication.processEvents(
+            QtCore.QEventLoop.ExcludeUserInputEvents |
+            QtCore.QEventLoop.ExcludeSocketNotifiers
+        )
         try:
             # call method associated with index
             self.methods[radio_index]()
@@ -132,10 +160,15 @@ class AnalysisTab(QtWidgets.QWidget):
             # switch to text tab to see if there are any other explanatory errors
             self.window().tab_widget.setCurrentIndex(0)
             QtWidgets.QMessageBox.critical(self.window(), 'Error', f'{type(e).__name__}: {e}')
-        # method executed, now can unfreeze
-        QtWidgets.QApplication.restoreOverrideCursor()
-        self.analyse.setEnabled(True)
-        self.analyse.setText('Analyse')
+        finally:
+            # method executed, now can unfreeze. deliver the user input
+            # deferred in the meantime first, so clicks made while busy are
+            # ignored rather than running the analysis again
+            QtWidgets.QApplication.processEvents()
+            AnalysisTab._busy = False
+            QtWidgets.QApplication.restoreOverrideCursor()
+            self.analyse.setEnabled(True)
+            self.analyse.setText('Analyse')
 
     def checkFileExists(self, index:int):
         '''
@@ -197,28 +230,81 @@ class AnalysisTab(QtWidgets.QWidget):
         If ignore_regex is set, the function ignores lines that match the
         regex.
         '''
-        data = []
-        for line in iterable:
-            # ignore finding floats on this line if matches regex
-            if ignore_regex and re.search(ignore_regex, line):
-                continue
-            # should find this number of floats per line, if not, ignore
-            # that line
-            matches = re.findall(r'\S+', line)
+        # remove lines that match the ignore regex first. this also makes sure
+        # iterable (which may be a file) can be read more than once
+        if ignore_regex:
+            ignore_search = re.compile(ignore_regex).search
+            lines = [line for line in iterable if not ignore_search(line)]
+        else:
+            lines = list(iterable)
+        # fast path: most files are a plain grid of floats, which numpy can
+        # parse in a single call. only try this if the first few lines look
+        # like the grid. numpy raises ValueError if a later line is not part of
+        # the grid, in which case fall back to going through each line
+        sample = [row for row in (line.split() for line in lines[:16]) if row]
+        try:
+            # float() raises ValueError if a cell isn't a float
+            sample = [list(map(float, row)) for row in sample]
+        except ValueError:
+            sample = []
+        if sample and all(len(row) == (floats_per_line or len(sample[0]))
+                          for row in sample):
             try:
-                # regex returns strings, need to convert into float
-                floats = list(map(float, matches))
+                data = np.loadtxt(lines, dtype=np.float64, comments=None, ndmin=2)
             except ValueError:
                 pass
             else:
-                if (floats_per_line and len(floats) == floats_per_line)\
-                or (floats_per_line is None and len(floats) > 0):
-                    data.append(floats)
+                return data
+
+        if floats_per_line:
+            # the number of floats per line is known, so the lines with exactly
+            # that many floats can be picked out of the text in a single regex
+            # search, which numpy can then parse in a single call
+            regex = re.compile(
+                r'^[^\S\n]*' +
+                r'[^\S\n]+'.join([f'(?:{AnalysisTab.FLOAT_REGEX})'] * floats_per_line) +
+                r'[^\S\n]*$',
+                re.MULTILINE|re.IGNORECASE|re.ASCII
+            )
+            matches = regex.findall('\n'.join(lines))
+            if matches:
+                data = np.loadtxt(matches, dtype=np.float64, comments=None, ndmin=2)
+            else:
+                data = []
+        else:
+            # collect the floats of all rows in one flat list, which numpy
+            # converts in a single call at the end. the first row found
+            # determines the number of columns
+            flat = []
+            extend = flat.extend
+            n_cols = None
+            for line in lines:
+                # should find at least one float per line, if not, ignore
+                # that line
+                matches = line.split()
+                try:
+                    # split returns strings, need to convert into float
+                    floats = list(map(float, matches))
+                except ValueError:
+                    continue
+                if len(floats) == 0:
+                    continue
+                if n_cols is None:
+                    n_cols = len(floats)
+                elif len(floats) != n_cols:
+                    raise ValueError(f'Found a row with {len(floats)} floats, '
+                                     f'expected {n_cols}.')
+                extend(floats)
+            if n_cols is None:
+                data = []
+            else:
+                data = np.fromiter(flat, dtype=np.float64, count=len(flat))
+                data = data.reshape(-1, n_cols)
         if len(data) == 0:
             # nothing found
             raise ValueError('No floats found in iterable. Check console '
                              'output to see what went wrong?')
-        return np.array(data)
+        return np.asarray(data)
 
     def runCmd(self, args:list, input:str=None) -> str:
         '''
@@ -230,10 +316,11 @@ class AnalysisTab(QtWidgets.QWidget):
         is ['ls', '-A', '/home/']. The keyword input is the a string to feed to
         stdin after the command execution.
         '''
-        if self.window().no_command.isChecked():
+        window = self.window()
+        if window.no_command.isChecked():
             # don't do anything if user has set no command mode
             return None
-        if self.window().allow_add_flags.isChecked():
+        if window.allow_add_flags.isChecked():
             # add additional flags set by the user
             # note: if the original command contains positional arguments
             # appending the extra flags at the end may not work, since the
@@ -242,27 +329,165 @@ class AnalysisTab(QtWidgets.QWidget):
             # workaround fails if the flags generated by the gui overwrite the
             # additional flags or cause an error -- may need to integrate this
             # extra flag into the gui if this is the case.
-            args[1:1] = shsplit(self.window().add_flags.text())
+            args[1:1] = shsplit(window.add_flags.text())
 
+        # output of the command, which is shown in the text tab as it is
+        # produced rather than all at once at the end
+        output = io.StringIO()
         try:
-            p = subprocess.run(args, input=input, cwd=self.window().dir.cwd,
-                               timeout=self.window().timeout.value(),
-                               check=True, text=True, stdout=subprocess.PIPE,
-                               stderr=subprocess.STDOUT)
-            self.window().text.setPlainText(p.stdout)
-            return p.stdout
+            # start the command in its own session, so it can be killed along
+            # with any child processes it has started
+            p = subprocess.Popen(args, cwd=window.dir.cwd,
+                                 stdin=None if input is None else subprocess.PIPE,
+                                 stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                 start_new_session=True)
+        except FileNotFoundError as e:
+            # custom message
+            e.strerror = 'The program cannot be found'
+            e.filename = args[0]
+            raise
+        # wait for the command in a thread pool thread, so the gui is still
+        # drawn while waiting. meanwhile, run an event loop that ignores user
+        # input (so nothing else can be run) until the command has finished
+        reader = CommandReader(p, output)
+        loop = QtCore.QEventLoop()
+        reader.signals.finished.connect(loop.quit)
+        # kill the process if it takes longer than the timeout. stop the reader
+        # as well, since a child process that escaped being killed could keep
+        # the output open indefinitely
+        timeout = window.timeout.value()
+        def kill():
+            try:
+                os.killpg(p.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            reader.stop()
+        kill_timer = QtCore.QTimer()
+        kill_timer.setSingleShot(True)
+        kill_timer.timeout.connect(kill)
+        # update text every 0.1 s, otherwise updating the text takes longer
+        # than the command itself. only the output produced since the last
+        # update is added, rather than replacing all of the text every time
+        shown = 0
+        def showOutput():
+            nonlocal shown
+            text = output.getvalue()
+            window.text.appendText(text[shown:])
+            shown = len(text)
+        text_timer = QtCore.QTimer()
+        text_timer.timeout.connect(showOutput)
+        window.text.clear()
+        QtCore.QThreadPool.globalInstance().start(reader)
+        if input is not None:
+            # feed stdin from another thread too, since writing it here would
+            # block the gui if the command doesn't read it. not in the thread
+            # pool, which may only have a single thread (used by the reader)
+            threading.Thread(target=CommandReader.writeInput,
+                             args=(p.stdin, input.encode()), daemon=True).start()
+        kill_timer.start(int(timeout*1000))
+        text_timer.start(100)
+        loop.exec_(QtCore.QEventLoop.ExcludeUserInputEvents)
+        text_timer.stop()
+        # the kill timer is no longer active if it has gone off
+        timed_out = not kill_timer.isActive()
+        kill_timer.stop()
+        # add whatever output is left since the last update (the reader has
+        # already waited for the command to exit or be killed)
+        showOutput()
+        stdout = output.getvalue()
+
+        try:
+            if timed_out:
+                raise subprocess.TimeoutExpired(args, timeout, output=stdout)
+            if p.returncode:
+                raise subprocess.CalledProcessError(p.returncode, args, output=stdout)
         except (subprocess.TimeoutExpired, subprocess.CalledProcessError) as e:
             # something went wrong executing the function. add the console
             # stdout to the end of the error string, then raise error again.
+            msg = str(e)
             if e.stdout:
-                msg = (f'{e} At the moment of this error, the console output '
-                       f'was:\n\n{e.stdout}')
+                msg += (' At the moment of this error, the console output '
+                        f'was:\n\n{e.stdout}')
             # TimeoutExpired and CalledProcessError do not have an attribute
             # for message, instead generating the message by overloading
             # __str__. workaround by just raising the base error type
             raise subprocess.SubprocessError(msg) from None
-        except FileNotFoundError as e:
-            # custom message
-            e.strerror = 'The program cannot be found'
-            e.filename = args[0]
-            raise
+        return stdout
+
+
+class CommandReader(QtCore.QRunnable):
+    '''
+    Reads the output of a running command (subprocess.Popen object) into a
+    buffer, to be run in a QThreadPool. Emits self.signals.finished once the
+    command has exited.
+    '''
+    class Signals(QtCore.QObject):
+        '''
+        QRunnable is not a QObject, so it can't have signals itself.
+        '''
+        finished = QtCore.pyqtSignal()
+
+    def __init__(self, process:subprocess.Popen, buffer:io.StringIO):
+        '''
+        Constructor method. process must have been opened in binary mode
+        (ie. without text=True) with stdout=subprocess.PIPE.
+        '''
+        super().__init__()
+        # runCmd keeps a reference to this, so don't let the pool delete it
+        self.setAutoDelete(False)
+        self.process = process
+        self.buffer = buffer
+        self.signals = self.Signals()
+        self.stopped = False
+
+    def stop(self):
+        '''
+        Stops reading the output (within 0.1 s), even if it has not ended.
+        '''
+        self.stopped = True
+
+    def run(self):
+        '''
+        Reads the output of the command until it exits.
+        '''
+        # read whatever output is available in large chunks rather than line
+        # by line, which is much faster for long outputs. decode it like text
+        # mode would (also converting \r\n and \r to \n), but replace invalid
+        # characters rather than stopping
+        decoder = io.IncrementalNewlineDecoder(
+            codecs.getincrementaldecoder('utf-8')(errors='replace'), translate=True
+        )
+        fd = self.process.stdout.fileno()
+        try:
+            # poll the output rather than blocking on it, so self.stop can
+            # interrupt waiting
+            with selectors.DefaultSelector() as selector:
+                selector.register(fd, selectors.EVENT_READ)
+                while not self.stopped:
+                    if not selector.select(0.1):
+                        continue
+                    if not (chunk := os.read(fd, 65536)):
+                        break
+                    self.buffer.write(decoder.decode(chunk))
+            self.buffer.write(decoder.decode(b'', final=True))
+            self.process.wait()
+        finally:
+            self.process.stdout.close()
+            self.signals.finished.emit()
+
+    @staticmethod
+    def writeInput(stdin, data:bytes):
+        '''
+        Writes data to the stdin of a command, then closes it. Like
+        subprocess.Popen.communicate, ignores the command exiting (or being
+        killed) before reading all of it.
+        '''
+        try:
+            stdin.write(data)
+        except BrokenPipeError:
+            pass
+        finally:
+            try:
+                stdin.close()
+            except BrokenPipeError:
+                pass
@@ -12,7 +12,7 @@ from PyQt5 import QtWidgets, QtCore
 class CoordinateSelector(QtWidgets.QWidget):
     '''
     A custom widget that allows the user to select a 'cut' along the DOFs, by
-    listing each mode label in a subwidget and allowing the user to select 'x',
+    listing each mode label in a row and allowing the user to select 'x',
     'y', or a value in the spin box for each DOF.
 
     By using str(), returns the selection of the coordinate value for each DOF,
@@ -29,15 +29,35 @@ class CoordinateSelector(QtWidgets.QWidget):
     This widget cannot function independently as it is tied to the
     AnalysisMain class, referred to using self.window().
     '''
+    # keywords starting and ending the SPF-BASIS-SECTION, used by
+    # findModeLabels
+    SPF_KEYWORDS = ('spf-basis-section', 'sbasis-section')
+    SPF_END_KEYWORDS = ('end-spf-basis-section', 'end-sbasis-section')
+    # entries in the SPF-BASIS-SECTION which are not mode labels
+    SPF_IGNORE = frozenset({'packets', 'gwp_type'})
+    # regexes used by findModeLabels to find the mode labels in a section.
+    # a list of dofs before an = sign, with a list of digits after (maybe
+    # including id keyword)
+    SPF_MODE_REGEX = re.compile(r'(.+?)=(?:[ \d,]|id)*')
+    # the first entry in each line
+    DDMODE_MODE_REGEX = re.compile(r'^\s*\S+', re.MULTILINE)
 
     def __init__(self, *args, **kwargs):
         '''
         Constructor method.
         '''
         super().__init__(*args, **kwargs)
-        # set a vertical box layout for this widget
-        self.setLayout(QtWidgets.QVBoxLayout())
+        # set a grid layout for this widget, with one row for each dof
+        self.setLayout(QtWidgets.QGridLayout())
         self.mode_labels = None
+        # the label, (x, y, value) selector and value spinbox in each row
+        self._labels = []
+        self._selects = []
+        self._values = []
+        # cache of the mode labels found by findModeLabels, with the input
+        # file path as the key and ((st_mtime_ns, st_size), mode labels) as
+        # the value
+        self._mode_label_cache = {}
 
     def __str__(self) -> str:
         '''
@@ -47,25 +67,23 @@ class CoordinateSelector(QtWidgets.QWidget):
 
         Invoke using str(<this widget>).
         '''
+        if not self._labels and self.layout().count():
+            # this means the widget only contains a label saying
+            # input/modes not found -> return empty string
+            return ''
         x_selected = False
-        out = ''
-        for i in range(self.layout().count()):
-            label = self.layout().itemAt(i).widget().findChild(QtWidgets.QLabel)
-            select = self.layout().itemAt(i).widget().findChild(QtWidgets.QComboBox)
-            value = self.layout().itemAt(i).widget().findChild(QtWidgets.QDoubleSpinBox)
-            if select is None:
-                # this means the widget only contains a label saying
-                # input/modes not found -> return empty string
-                return ''
-            if select.currentIndex() == 2:
-                out += f'{label.text()} {value.value()}\n'
+        lines = []
+        for label, select, value in zip(self._labels, self._selects, self._values):
+            index = select.currentIndex()
+            if index == 2:
+                lines.append(f'{label.text()} {value.value()}\n')
             else:
-                if select.currentIndex() == 0:
+                if index == 0:
                     x_selected = True
-                out += f'{label.text()} {select.currentText()}\n'
+                lines.append(f'{label.text()} {select.currentText()}\n')
         if not x_selected:
             raise ValueError('An x coordinate was not selected')
-        return out
+        return ''.join(lines)
 
     @property
     def xcoord(self) -> str:
@@ -73,11 +91,8 @@ class CoordinateSelector(QtWidgets.QWidget):
         Returns the mode label of the x coordinate chosen by the user. If
         no DOF is chosen to be 'x', returns None.
         '''
-        for i in range(self.layout().count()):
-            label = self.layout().itemAt(i).widget().findChild(QtWidgets.QLabel)
-            select = self.layout().itemAt(i).widget().findChild(QtWidgets.QComboBox)
-            # need to check that select is not None
-            if select and select.currentIndex() == 0:
+        for label, select in zip(self._labels, self._selects):
+            if select.currentIndex() == 0:
                 return label.text()
         return None
 
@@ -87,42 +102,66 @@ class CoordinateSelector(QtWidgets.QWidget):
         Returns the mode label of the y coordinate chosen by the user. If
         no DOF is chosen to be 'y', returns None.
         '''
-        for i in range(self.layout().count()):
-            label = self.layout().itemAt(i).widget().findChild(QtWidgets.QLabel)
-            select = self.layout().itemAt(i).widget().findChild(QtWidgets.QComboBox)
-            # need to check that select is not None
-            if select and select.currentIndex() == 1:
+        for label, select in zip(self._labels, self._selects):
+            if select.currentIndex() == 1:
                 return label.text()
         return None
 
     def refresh(self):
         '''
-        If the mode labels have changed (ie. directory was changed), clear all
-        existing mode widgets and replace them with new ones.
+        If the mode labels have changed (ie. directory was changed), replace the
+        existing mode widgets with new ones. See self.updateModeLabels.
         '''
         try:
             modes = self.findModeLabels()
             # only refresh if mode labels have changed
             if self.mode_labels != modes:
-                self.clearWidget()
-                self.mode_labels = modes
-                self.addModeLabels()
+                self.updateModeLabels(modes)
         except FileNotFoundError:
             self.clearWidget()
             self.layout().addWidget(
                 QtWidgets.QLabel('Input file not found. Press continue to\n'
-                                 'manually insert coordinates.')
+                                 'manually insert coordinates.'),
+                0, 0, 1, 3
             )
-        # set the height to be the combined widgets plus padding. there is
+        # set the height to be the combined rows plus padding. there is
         # probably a better way to do this but neither self.adjustSize() or
         # self.updateGeometry() work.
-        self.setFixedHeight(30 + 30*self.layout().count())
+        self.setFixedHeight(30 + 30*max(len(self._labels), 1))
+
+    def updateModeLabels(self, modes:list):
+        '''
+        Changes the mode rows to show the mode labels in modes. The rows at
+        the start whose mode label has not changed are kept, along with the
+        user's selection, and the rest are replaced.
+        '''
+        # find how many rows can be kept. none can be kept if the number of
+        # dofs changes to or from one, as then the selector only has 'x'
+        keep = 0
+        if len(self._labels) > 1 and len(modes) > 1:
+            for label, mode in zip(self._labels, modes):
+                if label.text() != mode:
+                    break
+                keep += 1
+        if keep == 0:
+            self.clearWidget()
+        else:
+            for widgets in [self._labels, self._selects, self._values]:
+                for widget in widgets[keep:]:
+                    self.layout().removeWidget(widget)
+                    widget.deleteLater()
+                del widgets[keep:]
+        self.mode_labels = modes
+        self.addModeLabels(keep)
 
     def clearWidget(self):
         '''
-        Removes all mode subwidgets from this widget.
+        Removes all mode rows from this widget.
         '''
         self.mode_labels = None
+        self._labels = []
+        self._selects = []
+        self._values = []
         while self.layout().count():
             child = self.layout().takeAt(0)
             if child.widget():
@@ -133,53 +172,86 @@ class CoordinateSelector(QtWidgets.QWidget):
         Returns the list of mode labels from the input file in the window's
         current directory. This list will be empty if the function cannot find
         any mode labels.
+
+        The result is cached, and the input file is only read again if its
+        modification time or size changes.
         '''
-        with open(self.window().dir.cwd/'input', mode='r', encoding='utf-8') as f:
-            txt = f.read()
-        # find labels in SPF-BASIS-SECTION (may also be called SBASIS-SECTION)
-        spf_section = re.findall(
-            r'S(?:PF-)?BASIS-SECTION\s*\n(.*)\nend-s(?:pf-)?basis-section',
-            txt, re.DOTALL|re.IGNORECASE
-        )
-        if spf_section:
+        path = self.window().dir.cwd/'input'
+        stat = path.stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._mode_label_cache.get(path)
+        if cached is not None and cached[0] == key:
+            return list(cached[1])
+        modes = self._readModeLabels(path)
+        self._mode_label_cache[path] = (key, modes)
+        return list(modes)
+
+    def _readModeLabels(self, path) -> list:
+        '''
+        Reads the input file at path and returns the list of mode labels in
+        it, which is empty if none can be found. See findModeLabels.
+        '''
+        spf_section = None
+        ddmode_section = None
+        # read the file line by line, collecting the lines of the section
+        # currently being read ('spf' or 'nmode')
+        section = None
+        lines = []
+        with open(path, mode='r', encoding='utf-8') as f:
+            for line in f:
+                key = line.rstrip().lower()
+                if section is None:
+                    # find SPF-BASIS-SECTION (may also be called SBASIS-SECTION)
+                    # or the nmode subsection in INITIAL-GEOMETRY-SECTION or
+                    # DD-GB-SECTION. make sure it isn't the end keyword.
+                    if key.endswith(self.SPF_KEYWORDS)\
+                            and not key.endswith(self.SPF_END_KEYWORDS):
+                        section, lines = 'spf', []
+                    elif ddmode_section is None and key.endswith('nmode')\
+                            and not key.endswith('end-nmode'):
+                        section, lines = 'nmode', []
+                elif section == 'spf' and key.startswith(self.SPF_END_KEYWORDS):
+                    # the spf section takes priority, no need to read further
+                    spf_section = ''.join(lines)
+                    break
+                elif section == 'nmode' and key.startswith('end-nmode'):
+                    ddmode_section = ''.join(lines)
+                    section = None
+                else:
+                    lines.append(line)
+        if spf_section is not None:
             # a list of dofs are displayed before an = sign, with a list
             # of digits after (maybe including id keyword). these may be on
             # a single line. match the part before =, split by comma, then
             # remove surrounding whitespace.
-            regex = r'(.+?)=(?:[ \d,]|id)*'
-            modes = [mode.strip() for line in re.findall(regex, spf_section[0])\
-                                  for mode in line.split(',')\
-                                  if mode.strip() not in ['packets', 'gwp_type']]
+            modes = (mode.strip() for line in self.SPF_MODE_REGEX.findall(spf_section)\
+                                  for mode in line.split(','))
+            modes = [mode for mode in modes if mode not in self.SPF_IGNORE]
             return modes
         # if section does not exist, might be direct dynamics. check for labels
-        # in a nmode subsection in INITIAL-GEOMETRY-SECTION or DD-GB-SECTION
-        ddmode_section = re.findall(r'nmode\s*\n(.*)\nend-nmode', txt,
-                                    re.DOTALL|re.IGNORECASE)
-        if ddmode_section:
+        # in the nmode subsection
+        if ddmode_section is not None:
             # a list of dofs are the first entry in each line (assuming
             # mode names can't have whitespace in them).
-            modes = re.findall(r'^\s*\S+', ddmode_section[0], re.MULTILINE)
+            modes = self.DDMODE_MODE_REGEX.findall(ddmode_section)
             return modes
         # can't find any labels...
         return []
 
-    def addModeLabels(self):
+    def addModeLabels(self, start:int=0):
         '''
-        Adds a mode subwidget for each mode label in self.mode_labels. The
-        user can then change the coordinate (x, y, or value) for that DOF
-        in the subwidget.
+        Adds a row for each mode label in self.mode_labels, starting from index
+        start (the rows before it should already exist). The user can then
+        change the coordinate (x, y, or value) for that DOF in the row.
 
-        If there is only one DOF, it must be the 'x' coordinate.
+        If there is only one DOF, it must be the 'x' coordinate. Otherwise the
+        new DOFs are set to 'value'. Then if no DOF is 'x' or 'y' (eg. because
+        the row that was has been removed), the first DOFs set to 'value',
+        new or not, are set to 'x' and 'y'.
         '''
         if self.mode_labels:
-            for i, mode in enumerate(self.mode_labels):
-                # add a new widget for each dof
-                mode_widget = QtWidgets.QWidget(self)
-                mode_layout = QtWidgets.QHBoxLayout(mode_widget)
-                mode_layout.setContentsMargins(QtCore.QMargins(0,0,0,0))
-                mode_widget.setLayout(mode_layout)
-                mode_widget.setFixedWidth(260)
-                # add components to widget: a label, (x, y, value) selector
+            for row, mode in enumerate(self.mode_labels[start:], start):
+                # add a new row for each dof: a label, (x, y, value) selector
                 # and a spinbox to choose the value if value is selected
                 label = QtWidgets.QLabel(mode)
                 select = QtWidgets.QComboBox()
@@ -188,21 +260,35 @@ class CoordinateSelector(QtWidgets.QWidget):
                     select.addItems(['x'])
                 else:
                     select.addItems(['x', 'y', 'value'])
-                    # set index of first two items to x, y, rest value.
-                    select.setCurrentIndex(min(i, 2))
+                    select.setCurrentIndex(2)
                 select.currentIndexChanged.connect(self.selectChanged)
                 value = QtWidgets.QDoubleSpinBox()
                 value.setRange(float('-inf'), float('inf'))
                 value.setDecimals(3)
                 # if x or y disable the value box
-                value.setEnabled(i >= 2)
-                for widget in [label, select, value]:
-                    mode_layout.addWidget(widget)
-                self.layout().addWidget(mode_widget)
+                value.setEnabled(select.currentIndex() == 2)
+                for column, widget in enumerate([label, select, value]):
+                    self.layout().addWidget(widget, row, column)
+                self._labels.append(label)
+                self._selects.append(select)
+                self._values.append(value)
+            if len(self.mode_labels) > 1:
+                # set the first items still set to value to x, y if no other
+                # item is. this triggers selectChanged, which disables the
+                # value box
+                selected = {select.currentIndex() for select in self._selects}
+                value_selects = iter([select for select in self._selects
+                                      if select.currentIndex() == 2])
+                for index in [0, 1]:
+                    if index not in selected:
+                        select = next(value_selects, None)
+                        if select is not None:
+                            select.setCurrentIndex(index)
         else:
             self.layout().addWidget(
                 QtWidgets.QLabel('Can\'t find modes in input file. Press\n'
-                                 'continue to manually insert coordinates.')
+                                 'continue to manually insert coordinates.'),
+                0, 0, 1, 3
             )
 
     @QtCore.pyqtSlot()
@@ -215,20 +301,15 @@ class CoordinateSelector(QtWidgets.QWidget):
             - There can only be one 'x' coordinate and one 'y' coordinate at
               a single time.
         '''
-        mode_changed = self.layout().indexOf(self.sender().parent())
-        index_changed = self.sender().currentIndex()
+        sender = self.sender()
+        index_changed = sender.currentIndex()
         # disable value if changed to x or y
-        value = self.sender().parent().findChild(QtWidgets.QDoubleSpinBox)
-        value.setEnabled(index_changed >= 2)
-        # if set to x or y, set any other x or y to value in other subwidgets
-        # (as there can only be one mode which is set to x or y)
+        self._values[self._selects.index(sender)].setEnabled(index_changed >= 2)
+        # if set to x or y, set any other x or y to value in other rows (as
+        # there can only be one mode which is set to x or y)
         if index_changed in [0, 1]:
-            for i in range(self.layout().count()):
-                if i == mode_changed:
-                    continue
-                select = self.layout().itemAt(i).widget().findChild(QtWidgets.QComboBox)
-                value = self.layout().itemAt(i).widget().findChild(QtWidgets.QDoubleSpinBox)
-                if select.currentIndex() == index_changed:
+            for select in self._selects:
+                if select is not sender and select.currentIndex() == index_changed:
                     # will automatically enable value as the following will
                     # trigger slot again
                     select.setCurrentIndex(2)
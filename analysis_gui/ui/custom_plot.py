@@ -6,13 +6,13 @@ Consists of the single class that provides the functionality for the plot
 widget.
 '''
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import shutil
 import subprocess
+import sys
 
 import numpy as np
 import pyqtgraph as pg
-import pyqtgraph.exporters
 from PyQt5 import QtWidgets, QtCore, QtGui
 
 class CustomPlotWidget(pg.PlotWidget):
@@ -24,6 +24,9 @@ class CustomPlotWidget(pg.PlotWidget):
     This widget cannot function independently as it is tied to the
     AnalysisMain class, referred to using self.window().
     '''
+    # whether saveVideo has found ffmpeg, shared between all instances. it is
+    # checked again while not found, in case the user installs it meanwhile
+    ffmpeg_found = False
 
     def __init__(self, *args, **kwargs):
         '''
@@ -69,18 +72,34 @@ class CustomPlotWidget(pg.PlotWidget):
         self.legend_checkbox.setCheckable(True)
         self.legend_checkbox.setChecked(True)
         self.legend_checkbox.triggered.connect(self.toggleLegend)
-        # colourbar that is displayed for contour plots. it's supposed to
-        # be used for image plots only, but plotContours uses it. we pass an
-        # empty ImageItem to its image parameter instead. you can also change
-        # the colourmap here. to find different ones execute
+        # the plot legend, shown or hidden by toggleLegend. curves are only
+        # added to the legend if it exists when they are plotted
+        self.legend = self.addLegend()
+        # colourmap used for contour plots. you can change the colourmap
+        # here. to find different ones execute
         #   pyqtgraph.examples.run()
         # and select the Colors -> Color Maps option.
         self.colourmap = pg.colormap.get('CET-R4')
-        self.colourbar = self.getPlotItem().addColorBar(
-            pg.ImageItem(), colorMap=self.colourmap, interactive=False
-        )
-        # hide until a contour plot is plotted
-        self.colourbar.hide()
+        # colourbar that is displayed for contour plots. it is only created
+        # (by self.getColourbar) when first needed, as building it takes about
+        # as long as the rest of the plot
+        self.colourbar = None
+
+    def getColourbar(self) -> pg.ColorBarItem:
+        '''
+        Returns the colourbar used for contour plots, creating it (hidden) the
+        first time this is called.
+        '''
+        if self.colourbar is None:
+            # it's supposed to be used for image plots only, but plotContours
+            # uses it. we pass an empty ImageItem to its image parameter
+            # instead.
+            self.colourbar = self.getPlotItem().addColorBar(
+                pg.ImageItem(), colorMap=self.colourmap, interactive=False
+            )
+            # hide until a contour plot is plotted
+            self.colourbar.hide()
+        return self.colourbar
 
     @QtCore.pyqtSlot()
     def changePlotTitle(self):
@@ -99,12 +118,10 @@ class CustomPlotWidget(pg.PlotWidget):
         Toggles the plot legend on and off, depending on the status of the show
         legend checkbox.
         '''
-        # if legend already exists, this just returns the legend
-        legend = self.addLegend()
         if self.legend_checkbox.isChecked():
-            legend.show()
+            self.legend.show()
         else:
-            legend.hide()
+            self.legend.hide()
 
     @QtCore.pyqtSlot()
     def saveData(self):
@@ -140,13 +157,17 @@ class CustomPlotWidget(pg.PlotWidget):
         Saves an .mp4 file of the current plot (which should be animated with
         slider control). Requires ffmpeg installed on the command line.
         '''
-        # make sure user has ffmpeg installed
-        try:
-            subprocess.run(['ffmpeg', '-version'], check=False)
-        except FileNotFoundError:
-            QtWidgets.QMessageBox.critical(self, 'Error',
-                'FileNotFoundError: Please install ffmpeg to call this function.')
-            return None
+        # make sure user has ffmpeg installed. this only needs to be checked
+        # until it has been found once (the version banner isn't needed)
+        if not CustomPlotWidget.ffmpeg_found:
+            try:
+                subprocess.run(['ffmpeg', '-version'], stdout=subprocess.DEVNULL,
+                               check=False)
+            except FileNotFoundError:
+                QtWidgets.QMessageBox.critical(self, 'Error',
+                    'FileNotFoundError: Please install ffmpeg to call this function.')
+                return None
+            CustomPlotWidget.ffmpeg_found = True
         # obtain a savename for the file
         savename, ok = QtWidgets.QFileDialog.getSaveFileName(self,
             "Save File", str(self.window().dir.cwd / 'Untitled.mp4'),
@@ -157,42 +178,103 @@ class CustomPlotWidget(pg.PlotWidget):
             return None
         # add .mp4 suffix to savename if not already
         savename = str(Path(savename).with_suffix('.mp4'))
-        # create a temporary directory in the same folder as chosen
-        temp_directory = Path(savename).parent/'frames'
-        temp_directory.mkdir(parents=True, exist_ok=True)
 
         # change cursor to wait cursor
         QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
-        # export image for each frame, into the temporary directory
-        exporter = pg.exporters.ImageExporter(self.plotItem)
-        for i in range(self.window().media.scrubber.minimum(),
-                       self.window().media.scrubber.maximum()+1):
-            self.window().media.scrubber.setSliderPosition(i)
-            exporter.export(str(temp_directory/f'{i:05}.png'))
-            # force pyqt to update slider immediately, so user can see progress
-            self.window().media.scrubber.repaint()
-        QtWidgets.QApplication.restoreOverrideCursor()
-
-        # run ffmpeg to generate video https://stackoverflow.com/questions/24961127
+        # the exporters are only needed here, so only import them when a video
+        # is first saved rather than when the program starts
+        from pyqtgraph.exporters import ImageExporter
+        exporter = ImageExporter(self.plotItem)
+        width, height = int(exporter.params['width']), int(exporter.params['height'])
+        # run ffmpeg to generate video, piping the raw pixels of each frame to
+        # its stdin, rather than saving each frame as an image first. the
+        # exported images are 32-bit ARGB, which is stored as BGRA in memory
+        # on little endian machines
         # no error if height not divisible by 2 https://stackoverflow.com/questions/20847674/
-        args = ['ffmpeg', '-y', '-framerate', str(self.window().media.speed),
-                '-pattern_type', 'glob', '-i', '*.png', '-c:v', 'libx264',
-                '-pix_fmt', 'yuv420p', '-vf',
-                'pad=ceil(iw/2)*2:ceil(ih/2)*2:color=white', str(savename)]
+        pix_fmt = 'bgra' if sys.byteorder == 'little' else 'argb'
+        args = ['ffmpeg', '-y', '-f', 'rawvideo', '-pix_fmt', pix_fmt,
+                '-video_size', f'{width}x{height}',
+                '-framerate', str(self.window().media.speed), '-i', '-',
+                '-c:v', 'libx264', '-pix_fmt', 'yuv420p', '-vf',
+                'pad=ceil(iw/2)*2:ceil(ih/2)*2:color=white', savename]
+        p = subprocess.Popen(args, stdin=subprocess.PIPE)
+        # export image for each frame. the scene can only be rendered in this
+        # thread, but the previous frame is written to ffmpeg in another
+        # thread at the same time. only one frame is written at a time so
+        # they stay in order and don't pile up in memory
+        scrubber = self.window().media.scrubber
+        frames = range(scrubber.minimum(), scrubber.maximum()+1)
+        # the scene can't be rendered outside this thread, so instead show a
+        # (window modal) progress dialog, which lets the window repaint and
+        # allows the user to cancel. only update it around 100 times in total,
+        # as each update processes events and repaints the window
+        progress = QtWidgets.QProgressDialog('Saving video...', 'Cancel', 0,
+                                             len(frames), self.window())
+        progress.setWindowModality(QtCore.Qt.WindowModal)
+        update_every = max(1, len(frames)//100)
+        writing = None
         try:
-            subprocess.run(args, cwd=temp_directory, check=True)
-        except subprocess.CalledProcessError as e:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                for n, i in enumerate(frames):
+                    if progress.wasCanceled():
+                        break
+                    scrubber.setSliderPosition(i)
+                    frame = exporter.export(toBytes=True)
+                    if writing is not None:
+                        writing.result()
+                    writing = executor.submit(self.writeFrame, p.stdin, frame)
+                    if n % update_every == 0:
+                        progress.setValue(n)
+                if writing is not None:
+                    writing.result()
+            if progress.wasCanceled():
+                p.kill()
+            else:
+                p.stdin.close()
+        except BrokenPipeError:
+            # ffmpeg has exited early, its return code is checked below
+            pass
+        finally:
+            # stdin also needs closing if ffmpeg was killed or exited early
+            try:
+                p.stdin.close()
+            except BrokenPipeError:
+                pass
+            p.wait()
+            canceled = progress.wasCanceled()
+            # the dialog is a child of the window, so delete it rather than
+            # leaving it hidden
+            progress.reset()
+            progress.deleteLater()
+            QtWidgets.QApplication.restoreOverrideCursor()
+        if canceled:
+            # remove the incomplete video
+            Path(savename).unlink(missing_ok=True)
+            return None
+        if p.returncode != 0:
+            e = subprocess.CalledProcessError(p.returncode, args)
             QtWidgets.QMessageBox.critical(self, 'Error',
-                f'{e.__class__.__name__}: {e} At the moment of this error, the '
-                f'console output was:\n\n{e.stdout}')
+                f'{e.__class__.__name__}: {e} See the console output of ffmpeg '
+                'for more information.')
             return None
-        # delete the temporary folder
-        shutil.rmtree(temp_directory)
         QtWidgets.QMessageBox.information(
             self, 'Success', 'Save video successful.'
         )
         return None
 
+    @staticmethod
+    def writeFrame(stream, frame:QtGui.QImage):
+        '''
+        Writes the raw 32-bit ARGB pixels of the QImage frame into the binary
+        stream. Used by saveVideo.
+        '''
+        # does not copy the image if it is already in this format (which
+        # images from pyqtgraph's ImageExporter are)
+        frame = frame.convertToFormat(QtGui.QImage.Format_ARGB32)
+        pixels = frame.constBits()
+        pixels.setsize(frame.sizeInBytes())
+        stream.write(pixels)
+
     def reset(self, switch_to_plot:bool=False, animated:bool=False):
         '''
         Resets the graph for replotting. Call this method before plotting
@@ -205,7 +287,8 @@ class CustomPlotWidget(pg.PlotWidget):
         self.setLabels(top='', bottom='', left='', colourbar='')
         self.getAxis('bottom').setTicks(None)
         self.getAxis('left').setTicks(None)
-        self.colourbar.hide()
+        if self.colourbar is not None:
+            self.colourbar.hide()
         self.toggleLegend()
         if animated:
             self.window().media.show()
@@ -231,7 +314,9 @@ class CustomPlotWidget(pg.PlotWidget):
                 self.default_title = value
                 self.changePlotTitle()
             elif key == 'colourbar':
-                self.colourbar.getAxis('left').setLabel(value)
+                # no need to create the colourbar just to clear its label
+                if value or self.colourbar is not None:
+                    self.getColourbar().getAxis('left').setLabel(value)
             else:
                 if isinstance(value, str):
                     value = (value,)
@@ -252,17 +337,21 @@ class CustomPlotWidget(pg.PlotWidget):
         # a single contour line is known as an isocurve in pyqtgraph. it does
         # not accept x or y values, only the data (z). to display it properly
         # we need to transform it using QtGui.QTransform first.
+        x_min, x_max = x.min(), x.max()
+        y_min, y_max = y.min(), y.max()
+        z_shape = np.shape(z)
         tr = QtGui.QTransform()
-        tr.translate(x.min(), y.min())
-        tr.scale((x.max() - x.min()) / np.shape(z)[0],
-                 (y.max() - y.min()) / np.shape(z)[1])
+        tr.translate(x_min, y_min)
+        tr.scale((x_max - x_min) / z_shape[0], (y_max - y_min) / z_shape[1])
         # create the isocurves, transforming each one
-        for i in range(len(levels)):
-            c = pg.IsocurveItem(data=z, level=levels[i], pen=colours[i])
+        add_item = self.getPlotItem().addItem
+        for level, colour in zip(levels, colours):
+            c = pg.IsocurveItem(data=z, level=level, pen=colour)
             c.setTransform(tr)
-            self.getPlotItem().addItem(c)
+            add_item(c)
         # automatically set axis limits may not be correct - set manually just
         # in case
-        self.setRange(xRange=[x.min(), x.max()], yRange=[y.min(), y.max()], padding=0)
-        self.colourbar.setLevels((levels[0], levels[-1]))
-        self.colourbar.show()
+        self.setRange(xRange=[x_min, x_max], yRange=[y_min, y_max], padding=0)
+        colourbar = self.getColourbar()
+        colourbar.setLevels((levels[0], levels[-1]))
+        colourbar.show()
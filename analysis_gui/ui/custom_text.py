@@ -7,7 +7,7 @@ widget.
 '''
 
 from math import isfinite
-from PyQt5 import QtWidgets, QtCore
+from PyQt5 import QtWidgets, QtCore, QtGui
 
 class CustomTextWidget(QtWidgets.QPlainTextEdit):
     '''
@@ -78,6 +78,16 @@ class CustomTextWidget(QtWidgets.QPlainTextEdit):
         else:
             self.setLineWrapMode(self.NoWrap)
 
+    def appendText(self, text:str):
+        '''
+        Adds text to the end of the text view. Unlike self.appendPlainText,
+        this does not start a new paragraph first, and it does not move the
+        cursor or scroll position.
+        '''
+        cursor = QtGui.QTextCursor(self.document())
+        cursor.movePosition(QtGui.QTextCursor.End)
+        cursor.insertText(text)
+
     def writeTable(self, table:list, header:list=None, colwidth:int=16,
                    pre:str=None, post:str=None):
         '''
@@ -101,32 +111,46 @@ class CustomTextWidget(QtWidgets.QPlainTextEdit):
             border_len = len(header) * (colwidth + 1)
         else:
             border_len = 0
+        border = '-'*border_len
 
-        self.clear()
+        # build up the lines of the table, then set the text all at once
+        # (appending each line seperately is very slow for large tables)
+        lines = []
         if pre:
-            self.appendPlainText(pre)
-        self.appendPlainText('-'*border_len)
+            lines.append(pre)
+        lines.append(border)
+        # format spec for everything else: align right with width colwidth
+        str_spec = f'>{colwidth}'
         # print header, wrapped by hyphens
         if header:
-            header = ''.join([f'{{:>{colwidth}}} '.format(col) for col in header])
-            self.appendPlainText(header)
-            self.appendPlainText('='*border_len)
+            lines.append(''.join(f'{col!s:{str_spec}} ' for col in header))
+            lines.append('='*border_len)
+        # format specs for floats: scientific format with 9 dp (8 dp if
+        # |exponent| > 100). the per-cell formatters are bound once here, as
+        # calling them is quicker than parsing a nested f-string spec per cell
+        format_float = f'{{: .{colwidth-7}e}} '.format
+        format_big_float = f'{{: .{colwidth-8}e}} '.format
         # print out results
         for row in table:
-            out = ''
+            cells = []
             for cell in row:
                 if isinstance(cell, float) and isfinite(cell):
-                    # scientific format with 9 dp (8 dp if |exponent| > 100)
-                    if abs(cell) >= 1e+100 or 0 < abs(cell) <= 1e-100:
-                        out += f'{{: .{colwidth-8}e}} '.format(cell)
+                    magnitude = abs(cell)
+                    if magnitude >= 1e+100 or 0 < magnitude <= 1e-100:
+                        cells.append(format_big_float(cell))
                     else:
-                        out += f'{{: .{colwidth-7}e}} '.format(cell)
+                        cells.append(format_float(cell))
                 else:
-                    # align right with width 16 (str() allows None to be formatted)
-                    out += f'{{:>{colwidth}}} '.format(str(cell))
-            self.appendPlainText(out)
+                    # str() allows None to be formatted
+                    cells.append(f'{cell!s:{str_spec}} ')
+            lines.append(''.join(cells))
         # show bottom border only if there is at least one result
         if len(table) > 0:
-            self.appendPlainText('-'*border_len)
+            lines.append(border)
         if post:
-            self.appendPlainText(post)
+            lines.append(post)
+        # appending an empty line to empty text does nothing, so leave out
+        # any empty lines at the start (eg. the border of an empty table)
+        while lines and not lines[0]:
+            del lines[0]
+        self.setPlainText('\n'.join(lines))
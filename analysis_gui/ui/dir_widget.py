@@ -7,6 +7,7 @@ editor.
 '''
 
 from pathlib import Path
+import os
 from PyQt5 import QtWidgets, QtCore, uic
 
 class DirectoryWidget(QtWidgets.QWidget):
@@ -28,6 +29,10 @@ class DirectoryWidget(QtWidgets.QWidget):
         # connect objects
         self.edit.editingFinished.connect(self.directoryChanged)
         self.button.clicked.connect(self.chooseDirectory)
+        # the last directory set (as text and as a Path), so directoryChanged
+        # can skip unchanged text and cwd doesn't have to rebuild the Path
+        self._last_dir = None
+        self._cwd = None
         # set text in edit to be the current working directory
         self.directoryChanged()
 
@@ -37,7 +42,10 @@ class DirectoryWidget(QtWidgets.QWidget):
         Getter for cwd attribute. Returns the Path object of the current
         directory.
         '''
-        return Path(self.edit.text())
+        text = self.edit.text()
+        if text == self._last_dir:
+            return self._cwd
+        return Path(text)
 
     @cwd.setter
     def cwd(self, dirname:str|Path):
@@ -46,9 +54,13 @@ class DirectoryWidget(QtWidgets.QWidget):
         must be a directory, otherwise raises an exception.
         '''
         # if path is valid, resolve it (change to absolute path without ./
-        # or ../, etc)
-        if self.cwd.is_dir():
-            self.edit.setText(str(Path(dirname).resolve()))
+        # or ../, etc). os.path.isdir only needs a single stat on the string,
+        # and returns False for paths that can't be accessed rather than
+        # raising an exception
+        if os.path.isdir(dirname):
+            self._cwd = Path(dirname).resolve()
+            self._last_dir = str(self._cwd)
+            self.edit.setText(self._last_dir)
         else:
             raise NotADirectoryError('Directory does not exist or is invalid')
 
@@ -57,14 +69,19 @@ class DirectoryWidget(QtWidgets.QWidget):
         '''
         Action to perform when the user edits the directory textbox.
         '''
+        text = self.edit.text()
         # set to cwd when the program is opened
-        if self.edit.text() == '':
+        if text == '':
             self.cwd = Path.cwd()
+        # editingFinished is also emitted whenever the textbox loses focus, so
+        # skip checking the directory again if it has not been edited
+        elif text == self._last_dir:
+            return
         # if the path is invalid, change to last acceptable path and open
         # error popup
         else:
             try:
-                self.cwd = self.edit.text()
+                self.cwd = text
             except NotADirectoryError as e:
                 self.edit.undo()
                 QtWidgets.QMessageBox.critical(self, 'Error',
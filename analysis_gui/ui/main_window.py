@@ -7,27 +7,66 @@ window, including menus.
 '''
 
 from pathlib import Path
+import fnmatch
+import os
+import re
 import subprocess
 from PyQt5 import QtWidgets, QtCore, QtGui, uic
 
-class AnalysisMain(QtWidgets.QMainWindow):
+# the form class generated from the .ui file (from the folder this .py file is
+# in rather than wherever this is executed). this is only done once, rather
+# than parsing the .ui file every time a window is created
+Ui_AnalysisMain, _ = uic.loadUiType(Path(__file__).parent/'main_window.ui')
+# the main window icon: the PsiPhi file in doc/graphics (from file location, go
+# up 4 folders for the main quantics directory)
+WINDOW_ICON = Path(__file__).parents[4]/'doc/graphics/PsiPhi_logo.png'
+
+class AnalysisMain(QtWidgets.QMainWindow, Ui_AnalysisMain):
     '''
     UI of the main window.
     '''
+    # glob-type filenames removed by cleanupDirectory
+    # ^ means this file is not associated with a command that is called in
+    # this ui
+    CLEANUP_GLOBS = (
+        'den1d_*',
+        'dens2d_*', # ^dengen
+        'spops',
+        'trajectory',
+        # pl files
+        'gpop.pl',
+        'natpop_*.pl',
+        'qdq_*.pl',
+        'spop.pl', # ^rdcheck spop (same function as statepop)
+        'spectrum.pl',
+        # log files
+        'ausw.log',
+        'dengen.log', # ^dengen
+        'gwptraj.log',
+        'norm.log',
+        'ortho.log',
+        'showd1d.log',
+        'showsys.log',
+        # xyz files
+        'pes.xyz',
+        'den2d.xyz',
+    )
+    # the globs combined into one regex (fnmatch.translate anchors each one at
+    # the end, so matching from the start checks the whole filename)
+    CLEANUP_REGEX = re.compile('|'.join(fnmatch.translate(glob) for glob in CLEANUP_GLOBS))
+
     def __init__(self):
         '''
         The method that is called when the instance is initialised.
         '''
         # call the inherited class' __init__ method
         super().__init__()
-        # load the .ui file (from the folder this .py file is in rather than
-        # wherever this is executed)
-        uic.loadUi(Path(__file__).parent/'main_window.ui', self)
+        # create the widgets from the .ui file
+        self.setupUi(self)
 
-        # set a main window icon. try to find the PsiPhi file in doc/graphics
-        # (from file location, go up 4 folders for the main quantics directory)
-        icon = Path(__file__).parents[4]/'doc/graphics/PsiPhi_logo.png'
-        self.setWindowIcon(QtGui.QIcon(str(icon)))
+        # set a main window icon, if the quantics logo could be found
+        if WINDOW_ICON.is_file():
+            self.setWindowIcon(QtGui.QIcon(str(WINDOW_ICON)))
 
         # hide additional flags box, media widget initially
         self.add_flags_box.hide()
@@ -41,7 +80,7 @@ class AnalysisMain(QtWidgets.QMainWindow):
         # connect objects
         # menu items
         self.menu_dir.triggered.connect(self.dir.chooseDirectory)
-        self.exit.triggered.connect(lambda: self.close())
+        self.exit.triggered.connect(self.close)
         self.cleanup.triggered.connect(self.cleanupDirectory)
         self.allow_add_flags.triggered.connect(self.showAddFlags)
         self.open_guide.triggered.connect(self.openUserGuide)
@@ -67,36 +106,12 @@ class AnalysisMain(QtWidgets.QMainWindow):
         analysis quantics programs (not from quantics itself), eg. trajectory
         from gwptraj, gpop.pl from rdgpop. If so, removes them.
         '''
-        # glob-type filenames to remove
-        # ^ means this file is not associated with a command that is called in
-        # this ui
-        file_glob = [
-            'den1d_*',
-            'dens2d_*', # ^dengen
-            'spops',
-            'trajectory',
-            # pl files
-            'gpop.pl',
-            'natpop_*.pl',
-            'qdq_*.pl',
-            'spop.pl', # ^rdcheck spop (same function as statepop)
-            'spectrum.pl',
-            # log files
-            'ausw.log',
-            'dengen.log', # ^dengen
-            'gwptraj.log',
-            'norm.log',
-            'ortho.log',
-            'showd1d.log',
-            'showsys.log',
-            # xyz files
-            'pes.xyz',
-            'den2d.xyz',
-        ]
-        # find the output files actually present in the directory
-        files = []
-        for glob in file_glob:
-            files.extend(list(self.dir.cwd.glob(glob)))
+        # find the output files actually present in the directory. list the
+        # directory once and match the names against all the patterns at once
+        cwd = self.dir.cwd
+        with os.scandir(cwd) as entries:
+            files = sorted(cwd/entry.name for entry in entries
+                           if entry.is_file() and self.CLEANUP_REGEX.match(entry.name))
 
         if files:
             clicked = QtWidgets.QMessageBox.question(
@@ -7,7 +7,7 @@ widget, which controls the playback for animated plots.
 '''
 
 from pathlib import Path
-from PyQt5 import QtWidgets, QtCore, uic
+from PyQt5 import QtWidgets, QtCore, QtGui, uic
 
 class MediaWidget(QtWidgets.QWidget):
     '''
@@ -23,26 +23,41 @@ class MediaWidget(QtWidgets.QWidget):
         super().__init__(*args, **kwargs)
         uic.loadUi(Path(__file__).parent/'media_widget.ui', self)
 
+        # icons already requested from the style, by QStyle.StandardPixmap
+        # name, so toggling play/pause doesn't create new icons every time
+        self._icons = {}
         # set icons for buttons
         for button, icon in [(self.ffstart, 'SP_MediaSkipBackward'),
                              (self.play, 'SP_MediaPlay'),
                              (self.ffend, 'SP_MediaSkipForward')]:
-            button.setIcon(
-                self.style().standardIcon(getattr(QtWidgets.QStyle, icon))
-            )
+            button.setIcon(self.getIcon(icon))
 
         # connect objects
-        self.ffstart.clicked.connect(lambda: self.scrubber.setValue(self.scrubber.minimum()))
-        self.ffend.clicked.connect(lambda: self.scrubber.setValue(self.scrubber.maximum()))
+        self.ffstart.clicked.connect(self.skipToStart)
+        self.ffend.clicked.connect(self.skipToEnd)
         self.speed_button.clicked.connect(self.changeSpeed)
         # connect the play button to a timer
         self.play.clicked.connect(self.startStopAnimation)
-        self.timer = QtCore.QTimer(self.play)
-        self.timer.timeout.connect(
-            lambda: self.scrubber.setValue(self.scrubber.value() + 1)
-        )
-        # playback speed that can be set by self.changeSpeed
+        self.timer = QtCore.QTimer(self)
+        # coarse timers may be off by 5%, which would noticeably change the
+        # playback speed (and differ from the framerate of saved videos)
+        self.timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self.timer.timeout.connect(self.advanceFrame)
+        # playback speed that can be set by self.changeSpeed. the timer
+        # increments one frame every [1000/speed] ms
         self.speed = 30.0
+        self.timer.setInterval(int(1000/self.speed))
+
+    def getIcon(self, icon_name:str) -> QtGui.QIcon:
+        '''
+        Returns the standard icon from the widget's style with the name
+        icon_name (eg. 'SP_MediaPlay'), creating it only on the first request.
+        '''
+        icon = self._icons.get(icon_name)
+        if icon is None:
+            icon = self.style().standardIcon(getattr(QtWidgets.QStyle, icon_name))
+            self._icons[icon_name] = icon
+        return icon
 
     @QtCore.pyqtSlot()
     def startStopAnimation(self):
@@ -50,17 +65,34 @@ class MediaWidget(QtWidgets.QWidget):
         Starts and stops the automatic playback of an animated plot.
         '''
         if self.play.isChecked():
-            self.play.setIcon(
-                self.style().standardIcon(QtWidgets.QStyle.SP_MediaPause)
-            )
-            # increment one frame every [1000/speed] ms
-            self.timer.start(int(1000/self.speed))
+            self.play.setIcon(self.getIcon('SP_MediaPause'))
+            self.timer.start()
         else:
-            self.play.setIcon(
-                self.style().standardIcon(QtWidgets.QStyle.SP_MediaPlay)
-            )
+            self.play.setIcon(self.getIcon('SP_MediaPlay'))
             self.timer.stop()
 
+    @QtCore.pyqtSlot()
+    def skipToStart(self):
+        '''
+        Moves the scrubber to the first frame.
+        '''
+        self.scrubber.setValue(self.scrubber.minimum())
+
+    @QtCore.pyqtSlot()
+    def skipToEnd(self):
+        '''
+        Moves the scrubber to the last frame.
+        '''
+        self.scrubber.setValue(self.scrubber.maximum())
+
+    @QtCore.pyqtSlot()
+    def advanceFrame(self):
+        '''
+        Moves the scrubber on by one frame. Called by the timer during
+        playback.
+        '''
+        self.scrubber.setValue(self.scrubber.value() + 1)
+
     @QtCore.pyqtSlot()
     def changeSpeed(self):
         '''
@@ -74,3 +106,5 @@ class MediaWidget(QtWidgets.QWidget):
         )
         if ok:
             self.speed = speed
+            # this also takes effect immediately if the animation is playing
+            self.timer.setInterval(int(1000/self.speed))